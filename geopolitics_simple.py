@@ -1,21 +1,35 @@
 import os
-import io
 import csv
+import atexit
+import functools
+import asyncio
+import threading
 import traceback
-from datetime import datetime
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 from flask import (
     Flask, render_template, request, jsonify, redirect, url_for,
     Response, abort
 )
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, DateTime, UniqueConstraint, Boolean
+    create_engine, event, inspect, text, Column, Integer, String, Text, DateTime, UniqueConstraint, Boolean,
+    Index, select, update
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import table, column
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import declarative_base, sessionmaker
+import ahocorasick
+import aiohttp
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
+from flask_caching import Cache
 from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
 
@@ -25,6 +39,17 @@ DB_FILE = os.environ.get("GEOPOLITICS_DB", "geopolitics.sqlite")
 USER_AGENT = os.environ.get("USER_AGENT", "GeopoliticsScraper/1.0 (+https://example.com)")
 SCRAPE_INTERVAL_MINUTES = int(os.environ.get("SCRAPE_INTERVAL_MINUTES", "10"))
 ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")  # set to enable admin actions
+INDEX_CACHE_SECONDS = int(os.environ.get("INDEX_CACHE_SECONDS", "60"))
+# on-disk by default so the scheduler process's cache.clear() reaches every web worker;
+# with SimpleCache invalidation is per-process and other workers lag by up to INDEX_CACHE_SECONDS
+INDEX_CACHE_TYPE = os.environ.get("INDEX_CACHE_TYPE", "FileSystemCache")
+INDEX_CACHE_DIR = os.environ.get("INDEX_CACHE_DIR", DB_FILE + ".cache")
+# opt-in: exactly one process should own the scrape job, so importing the app
+# (e.g. `gunicorn -w N`) never starts it; `python geopolitics_simple.py` does
+RUN_SCHEDULER = os.environ.get("RUN_SCHEDULER") == "1"
+HOST = os.environ.get("HOST", "0.0.0.0")
+PORT = int(os.environ.get("PORT", "5000"))
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", "8"))
 KEYWORDS = [k.strip().lower() for k in os.environ.get(
     "KEYWORDS",
     "russia,ukraine,china,taiwan,nato,israel,palestine,iran,afghanistan,india,modi,us,united states,syrian,korea,vladimir,zelensky"
@@ -40,11 +65,30 @@ DEFAULT_SOURCES = [
 
 HEADERS = {"User-Agent": USER_AGENT}
 
+# shared session so repeated hits to the same hosts reuse pooled keep-alive sockets
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=2))
+SESSION.mount("http://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=2))
+
 Base = declarative_base()
 engine = create_engine(f"sqlite:///{DB_FILE}", connect_args={"check_same_thread": False}, future=True)
 SessionLocal = sessionmaker(bind=engine, future=True)
 
 
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_conn, conn_record):
+    # WAL lets the Flask readers run alongside the scheduled writer, and
+    # synchronous=NORMAL drops the extra fsyncs per commit
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.execute("PRAGMA cache_size=-65536")
+    cur.close()
+
+
 class Article(Base):
     __tablename__ = "articles"
     id = Column(Integer, primary_key=True)
@@ -54,7 +98,13 @@ class Article(Base):
     summary = Column(Text)
     published = Column(DateTime, nullable=True)
     fetched_at = Column(DateTime, default=datetime.utcnow)
-    __table_args__ = (UniqueConstraint('url', name='uq_url'),)
+    __table_args__ = (
+        UniqueConstraint('url', name='uq_url'),
+        # serves ORDER BY published DESC NULLS LAST, fetched_at DESC straight from the
+        # index; SQLite rejects NULLS LAST in an index but DESC already sorts NULLs last
+        Index("ix_articles_order", published.desc(), fetched_at.desc()),
+        Index("ix_articles_fetched_at", fetched_at.desc()),
+    )
 
 
 class Source(Base):
@@ -64,11 +114,87 @@ class Source(Base):
     type = Column(String(50))  # 'rss' or 'html'
     url = Column(String(2048), unique=True)
     enabled = Column(Boolean, default=True)
+    etag = Column(String(255), nullable=True)  # HTTP validators for conditional GET
+    modified = Column(String(255), nullable=True)
 
 
 Base.metadata.create_all(bind=engine)
 
 
+def ensure_source_columns():
+    # create_all() won't add columns to a table that already exists
+    existing = {c["name"] for c in inspect(engine).get_columns("sources")}
+    with engine.begin() as conn:
+        for name in ("etag", "modified"):
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE sources ADD COLUMN {name} VARCHAR(255)"))
+
+
+ensure_source_columns()
+
+
+def ensure_article_indexes():
+    # same story for indexes declared after the articles table was first created
+    for ix in Article.__table__.indexes:
+        ix.create(bind=engine, checkfirst=True)
+
+
+ensure_article_indexes()
+
+
+# FTS5 index over articles(title, summary), kept in sync by triggers. Managed with
+# raw DDL because virtual tables don't fit Base.metadata.
+ARTICLES_FTS = table("articles_fts", column("rowid"))
+
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE articles_fts USING fts5(title, summary, content='articles', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+    END""",
+    # backfill rows stored before the index existed
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+]
+
+
+def ensure_articles_fts():
+    if inspect(engine).has_table("articles_fts"):
+        return
+    with engine.begin() as conn:
+        for stmt in FTS_DDL:
+            conn.execute(text(stmt))
+
+
+ensure_articles_fts()
+
+
+def fts_query(q):
+    """Turn free-form search text into an FTS5 MATCH expression of quoted prefix terms."""
+    terms = [t.replace('"', '""') for t in q.split()]
+    return " ".join(f'"{t}"*' for t in terms if t)
+
+
+# read statements built once at import and reused by every request
+_ARTICLE_ORDER = (Article.published.desc().nullslast(), Article.fetched_at.desc())
+_INDEX_STMT = select(Article).order_by(*_ARTICLE_ORDER).limit(300)
+_SEARCH_STMT = (
+    select(Article)
+    .join(ARTICLES_FTS, ARTICLES_FTS.c.rowid == Article.id)
+    .where(text("articles_fts MATCH :match"))
+    .order_by(*_ARTICLE_ORDER)
+    .limit(300)
+)
+_API_STMT = select(Article).order_by(*_ARTICLE_ORDER).limit(500)
+_EXPORT_STMT = select(Article).order_by(*_ARTICLE_ORDER).execution_options(yield_per=500)
+_ENABLED_SOURCES_STMT = select(Source).where(Source.enabled.is_(True))
+
+
 def ensure_default_sources():
     session = SessionLocal()
     try:
@@ -86,94 +212,287 @@ ensure_default_sources()
 
 
 
-def parse_rss(url):
+def build_keyword_automaton(keywords):
+    ac = ahocorasick.Automaton()
+    for k in keywords:
+        if k:
+            ac.add_word(k, k)
+    ac.make_automaton()
+    return ac
+
+
+KEYWORD_AC = build_keyword_automaton(KEYWORDS)
+
+
+def match_keywords(s, ac=KEYWORD_AC):
+    """True if any keyword occurs in s; one automaton pass whatever the keyword count."""
+    if ac.kind != ahocorasick.AHOCORASICK:
+        return False
+    return next(ac.iter(s.lower()), None) is not None
+
+
+def published_datetime(entry):
+    """Naive UTC publish time of a feed entry, or None."""
+    parsed = entry.get("published_parsed")
+    if parsed:
+        try:
+            return datetime(*parsed[:6])
+        except Exception:
+            pass
+    # feedparser gave up on the date; most feeds use RFC 822, which the stdlib handles
+    raw = entry.get("published")
+    if not raw:
+        return None
+    try:
+        dt = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def parse_rss(content, response_headers=None):
+    """
+    Parse already-downloaded feed content into items. `response_headers` should
+    carry its content-location and content-type so relative links and the
+    charset resolve as if feedparser had fetched the URL itself.
+    """
     out = []
-    feed = feedparser.parse(url)
+    # summaries go out raw through /api/articles and /export.csv, so keep feedparser's
+    # sanitizer; rewriting relative URIs inside the summary HTML is wasted work though
+    feed = feedparser.parse(content, response_headers=response_headers, resolve_relative_uris=False)
     for e in (feed.entries or [])[:60]:
         title = e.get("title")
         link = e.get("link")
         summary = e.get("summary") or e.get("description") or ""
-        published = None
-        if getattr(e, "published_parsed", None):
-            try:
-                published = datetime(*e.published_parsed[:6])
-            except Exception:
-                published = None
-        out.append({"title": title, "url": link, "summary": summary, "published": published})
+        published = published_datetime(e)
+        # tag once here so store_items doesn't have to rescan the same text
+        matched = match_keywords((title or "") + " " + (link or ""))
+        out.append({"title": title, "url": link, "summary": summary, "published": published, "_matched": matched})
     return out
 
 
 def fetch_html(url, timeout=12):
-    r = requests.get(url, headers=HEADERS, timeout=timeout)
+    r = SESSION.get(url, timeout=timeout)
     r.raise_for_status()
     return r.text
 
 
-def extract_links_with_keywords(html, base_url, keywords):
-    soup = BeautifulSoup(html, "html.parser")
-    found = []
-    for a in soup.find_all("a", href=True):
-        text = (a.get_text() or "").strip()
-        href = urljoin(base_url, a['href'])
-        combined = (text + " " + href).lower()
-        if any(k in combined for k in keywords):
-            found.append({"title": text or href, "url": href, "summary": ""})
-
+def extract_links_with_keywords(html, base_url, keywords, encoding=None):
+    """
+    `html` is normally the raw response bytes; `encoding` is the charset from the
+    HTTP Content-Type, if any. Without it lxml reads <meta charset> / the XML prolog.
+    """
+    ac = KEYWORD_AC if keywords is KEYWORDS else build_keyword_automaton(keywords)
+    if not html or not html.strip():
+        return []
+    if isinstance(html, str):
+        # lxml rejects str carrying an encoding declaration, so hand it bytes instead
+        html, encoding = html.encode("utf-8"), "utf-8"
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    # walk links with lxml's C-level iterlinks(); no BeautifulSoup wrapper per anchor
+    try:
+        doc = lxml.html.fromstring(html, parser=parser)
+    except lxml.etree.ParserError:
+        # e.g. "Document is empty" for a page that is only comments/whitespace
+        return []
+    doc.make_links_absolute(base_url, handle_failures="ignore")
     seen = set()
     out = []
-    for it in found:
-        if it["url"] not in seen:
-            out.append(it)
-            seen.add(it["url"])
-    return out[:80]
+    for el, attr, href, pos in doc.iterlinks():
+        if attr != "href" or el.tag != "a" or href in seen:
+            continue
+        text = (el.text_content() or "").strip()
+        if not match_keywords(text + " " + href, ac):
+            continue
+        # only matched links count as seen; a later anchor with better text may still match
+        seen.add(href)
+        out.append({"title": text or href, "url": href, "summary": "", "_matched": True})
+        if len(out) >= 80:
+            break
+    return out
 
 
-def scrape_source(source):
+async def fetch_html_async(session, url):
+    """
+    Returns (content, charset). The body is left undecoded so lxml can fall back
+    to the page's own charset declaration when the header doesn't give one.
+    """
+    async with session.get(url) as r:
+        r.raise_for_status()
+        return await r.read(), r.charset
+
+
+async def fetch_feed_async(session, url, etag=None, modified=None):
+    """
+    Conditional GET of a feed. Returns (content, response_headers, etag, modified);
+    content is None when the server answers 304 Not Modified. response_headers
+    is what feedparser needs to treat the bytes as if it had fetched `url` itself.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    async with session.get(url, headers=headers) as r:
+        if r.status == 304:
+            return None, None, etag, modified
+        r.raise_for_status()
+        response_headers = {
+            "content-location": str(r.url),
+            "content-type": r.headers.get("Content-Type", ""),
+            "content-language": r.headers.get("Content-Language", ""),
+        }
+        return await r.read(), response_headers, r.headers.get("ETag"), r.headers.get("Last-Modified")
+
+
+async def scrape_source_async(session, source):
+    """
+    Scrape one source: downloads over aiohttp and runs the blocking parse step
+    in the default executor. For RSS sources the new etag/modified validators
+    are written back into `source` once the feed has parsed.
+    """
+    loop = asyncio.get_running_loop()
     try:
         if source.get("type") == "rss":
-            return parse_rss(source.get("url"))
+            content, response_headers, etag, modified = await fetch_feed_async(
+                session, source.get("url"), source.get("etag"), source.get("modified"))
+            if content is None:
+                return []
+            items = await loop.run_in_executor(
+                None, functools.partial(parse_rss, content, response_headers=response_headers))
+            source["etag"], source["modified"] = etag, modified
+            return items
         else:
-            html = fetch_html(source.get("url"))
-            return extract_links_with_keywords(html, source.get("url"), KEYWORDS)
+            html, charset = await fetch_html_async(session, source.get("url"))
+            return await loop.run_in_executor(
+                None, extract_links_with_keywords, html, source.get("url"), KEYWORDS, charset)
     except Exception as e:
         print(f"Error scraping {source.get('name') or source.get('url')}: {e}")
         traceback.print_exc()
         return []
 
 
-def scrape_source_obj(src_obj):
-    src = {"name": src_obj.name, "type": src_obj.type, "url": src_obj.url}
-    return scrape_source(src)
+# aiohttp sessions are bound to the loop that created them, so scrapes from any
+# thread (scheduler, /scrape_now) run on one long-lived loop that owns one session
+_ASYNC_LOOP = None
+_ASYNC_LOOP_LOCK = threading.Lock()
+_AIOHTTP_SESSION = None
+
+
+def get_async_loop():
+    global _ASYNC_LOOP
+    with _ASYNC_LOOP_LOCK:
+        if _ASYNC_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="scrape-loop", daemon=True).start()
+            _ASYNC_LOOP = loop
+    return _ASYNC_LOOP
+
 
+def run_async(coro):
+    """Run a coroutine on the shared loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, get_async_loop()).result()
+
+
+async def get_aiohttp_session():
+    # only ever called on the shared loop, so no locking needed
+    global _AIOHTTP_SESSION
+    if _AIOHTTP_SESSION is None or _AIOHTTP_SESSION.closed:
+        # keep DNS entries and idle sockets for a full scrape interval so the next tick reuses them
+        reuse_seconds = SCRAPE_INTERVAL_MINUTES * 60 + 60
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=reuse_seconds, keepalive_timeout=reuse_seconds)
+        _AIOHTTP_SESSION = aiohttp.ClientSession(
+            headers=HEADERS, timeout=aiohttp.ClientTimeout(total=15), connector=connector)
+    return _AIOHTTP_SESSION
+
+
+@atexit.register
+def _close_aiohttp_session():
+    if _ASYNC_LOOP is None or _AIOHTTP_SESSION is None or _AIOHTTP_SESSION.closed:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_AIOHTTP_SESSION.close(), _ASYNC_LOOP).result(timeout=5)
+    except Exception:
+        pass
+
+
+async def _scrape_all_async(sources):
+    session = await get_aiohttp_session()
+    return await asyncio.gather(*(scrape_source_async(session, src) for src in sources))
+
+
+async def _prewarm_async(urls):
+    session = await get_aiohttp_session()
+
+    async def head(url):
+        try:
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+        except Exception:
+            pass
+
+    await asyncio.gather(*(head(u) for u in urls))
+
+
+def prewarm_connections(urls):
+    """
+    Resolve DNS and open TLS connections in the aiohttp pool to the source hosts
+    ahead of the first scrape. Blocks for at most the 5s HEAD timeout.
+    """
+    run_async(_prewarm_async(urls))
+
+
+def store_items(items, source_name, source_id=None, validators=None):
+    """
+    Insert new articles for one source and return how many were added.
+    `validators` ({"etag": ..., "modified": ...}) for `source_id` are saved in the
+    same transaction, so a feed only stops being re-fetched once its items are stored.
+    """
+    rows = []
+    seen = set()
+    for it in items:
+        title = (it.get("title") or "").strip()
+        url = it.get("url")
+        if not url or not title or url in seen:
+            continue
+        matched = it.get("_matched")
+        if matched is None:
+            matched = match_keywords(title + " " + url)
+        if not matched and "al jazeera" not in source_name.lower():
+            continue
+        seen.add(url)
+        rows.append({
+            "source": source_name[:255],
+            "title": title[:1024],
+            "url": url[:2048],
+            "summary": (it.get("summary") or "")[:4000],
+            "published": it.get("published"),
+            "fetched_at": datetime.utcnow(),
+        })
+    if source_id is None:
+        validators = None
+    if not rows and not validators:
+        return 0
 
-def store_items(items, source_name):
     session = SessionLocal()
     added = 0
     try:
-        for it in items:
-            try:
-                title = (it.get("title") or "").strip()
-                url = it.get("url")
-                if not url or not title:
-                    continue
-                low = (title + " " + (url or "")).lower()
-                if not any(k in low for k in KEYWORDS) and "al jazeera" not in source_name.lower():
-                    continue
-                exists = session.query(Article).filter(Article.url == url).first()
-                if exists:
-                    continue
-                art = Article(
-                    source=source_name[:255],
-                    title=title[:1024],
-                    url=url[:2048],
-                    summary=(it.get("summary") or "")[:4000],
-                    published=it.get("published")
-                )
-                session.add(art)
-                session.commit()
-                added += 1
-            except Exception:
-                session.rollback()
+        with session.begin():
+            if rows:
+                # single multi-row INSERT ... ON CONFLICT(url) DO NOTHING; the UNIQUE(url)
+                # index drops already-stored articles without a SELECT per item
+                stmt = sqlite_insert(Article.__table__).values(rows).on_conflict_do_nothing(index_elements=["url"])
+                result = session.execute(stmt)
+                added = max(result.rowcount or 0, 0)
+            if validators:
+                session.execute(update(Source).where(Source.id == source_id).values(**validators))
+    except SQLAlchemyError as e:
+        # e.g. "database is locked" while another scrape writes; skip this source, keep going
+        print(f"Error storing articles from {source_name}: {e}")
+        traceback.print_exc()
+        added = 0
     finally:
         session.close()
     return added
@@ -182,14 +501,23 @@ def store_items(items, source_name):
 def scrape_all():
     session = SessionLocal()
     try:
-        sources = session.query(Source).filter(Source.enabled == True).all()
+        sources = session.scalars(_ENABLED_SOURCES_STMT).all()
     finally:
         session.close()
+    srcs = [{"id": s.id, "name": s.name, "type": s.type, "url": s.url,
+             "etag": s.etag, "modified": s.modified} for s in sources]
+    # fetch every source concurrently, then store each batch in its own transaction
+    results = run_async(_scrape_all_async(srcs))
     total = 0
-    for src in sources:
-        items = scrape_source_obj(src)
-        n = store_items(items, src.name)
+    for src, before, items in zip(srcs, sources, results):
+        validators = None
+        if (src["etag"], src["modified"]) != (before.etag, before.modified):
+            validators = {"etag": src["etag"], "modified": src["modified"]}
+        n = store_items(items, src["name"], source_id=src["id"], validators=validators)
         total += n
+    if total:
+        # drop cached index pages so the new articles show up right away
+        cache.clear()
     print(f"[{datetime.utcnow().isoformat()}] Added {total} new articles")
     return total
 
@@ -203,7 +531,7 @@ def fetch_full_text_and_summary(url, max_paragraphs=3):
     """
     try:
         html = fetch_html(url, timeout=15)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         article_el = soup.find("article")
         paras = []
         if article_el:
@@ -233,7 +561,25 @@ def fetch_full_text_and_summary(url, max_paragraphs=3):
         return None
 
 
+def fetch_full_batch(urls, max_workers=10, max_paragraphs=3):
+    """
+    Fetch summaries for many URLs in parallel over the shared SESSION pool.
+    Returns {url: summary or None}.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        summaries = ex.map(lambda u: fetch_full_text_and_summary(u, max_paragraphs=max_paragraphs), urls)
+        return dict(zip(urls, summaries))
+
+
 app = Flask(__name__, static_folder="static", template_folder="templates")
+cache = Cache(app, config={
+    "CACHE_TYPE": INDEX_CACHE_TYPE,
+    "CACHE_DIR": INDEX_CACHE_DIR,
+    "CACHE_DEFAULT_TIMEOUT": INDEX_CACHE_SECONDS,
+})
 
 
 @app.context_processor
@@ -242,18 +588,20 @@ def inject_now():
 
 
 @app.route("/")
+@cache.cached(timeout=INDEX_CACHE_SECONDS, query_string=True)
 def index():
     q = request.args.get("q", "").strip().lower()
     session = SessionLocal()
     try:
-        rows = session.query(Article).order_by(Article.published.desc().nullslast(), Article.fetched_at.desc()).limit(300).all()
+        if q:
+            rows = session.scalars(_SEARCH_STMT, {"match": fts_query(q)}).all()
+        else:
+            rows = session.scalars(_INDEX_STMT).all()
     finally:
         session.close()
-    if q:
-        rows = [r for r in rows if q in (r.title or "").lower() or q in (r.summary or "").lower()]
     session = SessionLocal()
     try:
-        srcs = session.query(Source).filter(Source.enabled == True).all()
+        srcs = session.scalars(_ENABLED_SOURCES_STMT).all()
         source_names = ", ".join([s.name for s in srcs])
     finally:
         session.close()
@@ -264,7 +612,7 @@ def index():
 def article_view(article_id):
     session = SessionLocal()
     try:
-        art = session.query(Article).get(article_id)
+        art = session.get(Article, article_id)
     finally:
         session.close()
     if not art:
@@ -274,41 +622,43 @@ def article_view(article_id):
 
 @app.route("/article/<int:article_id>/fetch_full", methods=["POST"])
 def article_fetch_full(article_id):
-    session = SessionLocal()
     try:
-        art = session.query(Article).get(article_id)
-        if not art:
-            abort(404)
-        summary = fetch_full_text_and_summary(art.url, max_paragraphs=4)
-        if summary:
-            art.summary = summary
-            art.fetched_at = datetime.utcnow()
-            session.add(art)
-            session.commit()
+        # art is already tracked by the session; begin() commits on exit, rolls back on error
+        with SessionLocal() as session, session.begin():
+            art = session.get(Article, article_id)
+            if not art:
+                abort(404)
+            summary = fetch_full_text_and_summary(art.url, max_paragraphs=4)
+            if summary:
+                art.summary = summary
+                art.fetched_at = datetime.utcnow()
     except Exception as e:
-        session.rollback()
         print("Error fetching full text:", e)
         traceback.print_exc()
-    finally:
-        session.close()
     return redirect(url_for("article_view", article_id=article_id))
 
 
+class Echo:
+    """Pseudo-file for csv.writer: write() returns the formatted line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
 @app.route("/export.csv")
 def export_csv():
-    session = SessionLocal()
-    try:
-        rows = session.query(Article).order_by(Article.published.desc().nullslast(), Article.fetched_at.desc()).all()
-    finally:
-        session.close()
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["id", "title", "url", "source", "published", "fetched_at", "summary"])
-    for r in rows:
-        writer.writerow([r.id, r.title, r.url, r.source, r.published.isoformat() if r.published else "", r.fetched_at.isoformat(), (r.summary or "").replace("\n", " ").strip()])
-    contents = output.getvalue()
-    output.close()
-    return Response(contents, mimetype="text/csv", headers={"Content-Disposition": "attachment;filename=geopolitics_articles.csv"})
+    def generate():
+        writer = csv.writer(Echo())
+        yield writer.writerow(["id", "title", "url", "source", "published", "fetched_at", "summary"])
+        session = SessionLocal()
+        try:
+            rows = session.scalars(_EXPORT_STMT)
+            for r in rows:
+                yield writer.writerow([r.id, r.title, r.url, r.source, r.published.isoformat() if r.published else "", r.fetched_at.isoformat(), (r.summary or "").replace("\n", " ").strip()])
+        finally:
+            session.close()
+    # stream rows as they come off the cursor rather than building the whole CSV in memory
+    return Response(generate(), mimetype="text/csv", headers={"Content-Disposition": "attachment;filename=geopolitics_articles.csv"})
 
 @app.route("/scrape_now")
 def scrape_now():
@@ -354,6 +704,7 @@ def admin_add():
         s = Source(name=name, type=stype, url=url, enabled=True)
         session.add(s)
         session.commit()
+        cache.clear()
     except Exception as e:
         session.rollback()
         return f"Error adding source: {e}", 400
@@ -370,11 +721,12 @@ def admin_toggle():
     sid = request.form.get("id")
     session = SessionLocal()
     try:
-        s = session.query(Source).get(int(sid))
+        s = session.get(Source, int(sid))
         if s:
             s.enabled = not s.enabled
             session.add(s)
             session.commit()
+            cache.clear()
     except Exception:
         session.rollback()
     finally:
@@ -390,10 +742,11 @@ def admin_delete():
     sid = request.form.get("id")
     session = SessionLocal()
     try:
-        s = session.query(Source).get(int(sid))
+        s = session.get(Source, int(sid))
         if s:
             session.delete(s)
             session.commit()
+            cache.clear()
     except Exception:
         session.rollback()
     finally:
@@ -408,7 +761,7 @@ def admin_delete():
 def api_articles():
     session = SessionLocal()
     try:
-        rows = session.query(Article).order_by(Article.published.desc().nullslast(), Article.fetched_at.desc()).limit(500).all()
+        rows = session.scalars(_API_STMT).all()
     finally:
         session.close()
     out = []
@@ -426,7 +779,30 @@ def api_articles():
 
 scheduler = BackgroundScheduler()
 scheduler.add_job(func=scrape_all, trigger="interval", minutes=SCRAPE_INTERVAL_MINUTES, next_run_time=datetime.now())
-scheduler.start()
+
+
+def start_scheduler():
+    if scheduler.running:
+        return
+    session = SessionLocal()
+    try:
+        urls = [s.url for s in session.scalars(_ENABLED_SOURCES_STMT).all()]
+    finally:
+        session.close()
+    # the first job runs immediately, so warm the hosts before it is scheduled
+    prewarm_connections(urls)
+    scheduler.start()
+
+
+def is_reloader_parent():
+    # a direct run with FLASK_ENV=development uses the debug reloader, whose parent
+    # process only watches files; the child it spawns (WERKZEUG_RUN_MAIN=true) serves
+    return (__name__ == "__main__" and os.environ.get("FLASK_ENV") == "development"
+            and os.environ.get("WERKZEUG_RUN_MAIN") != "true")
+
+
+if RUN_SCHEDULER and not is_reloader_parent():
+    start_scheduler()
 
 
 
@@ -434,10 +810,14 @@ if __name__ == "__main__":
     print("Starting enhanced geopolitics scraper webapp...")
     if not ADMIN_TOKEN:
         print("Warning: ADMIN_TOKEN not set — admin actions disabled. Set ADMIN_TOKEN env var to enable.")
-    try:
-        scrape_all()
-    except Exception as e:
-        print("Initial scrape failed:", e)
-        traceback.print_exc()
-   
-    app.run(debug=True, port=5000)
+    # a direct run is a single process, so it owns the scheduler; with the debug
+    # reloader only the child that actually serves requests starts it. The job's
+    # first run fires immediately after prewarm, so it doubles as the initial scrape.
+    if not is_reloader_parent():
+        start_scheduler()
+
+    if os.environ.get("FLASK_ENV") == "development":
+        app.run(debug=True, port=PORT)
+    else:
+        from waitress import serve
+        serve(app, host=HOST, port=PORT, threads=WSGI_THREADS)